@@ -1,45 +1,114 @@
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
 import os
 import re
-import requests
-import json
+import aiohttp
+import httpx
 import psutil
 import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datasketch import MinHash, MinHashLSH
+from datetime import datetime, time as dt_time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from diskcache import Cache
 from dotenv import load_dotenv
-from newspaper import Article
+from newspaper import Article, Config
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 import openai
+import orjson
+import tiktoken
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 console = Console()
 
 # Load environment variables
 load_dotenv()
 
+# HTTP Settings
+HTTP_TIMEOUT = (3, 120)  # (connect, read) seconds, so a dead server can't hang the script forever
+HTTP_MAX_CONNECTIONS = 32  # Shared pool size for FreshRSS, article downloads, Ollama and OpenAI
+HTTP_MAX_CONNECTIONS_PER_HOST = 16
+HTTP_KEEPALIVE_TIMEOUT = 60  # Seconds to keep idle connections open for reuse
+
+# newspaper3k settings: skip image probing/downloads and its own URL memoization
+_NEWS_CFG = Config()
+_NEWS_CFG.fetch_images = False
+_NEWS_CFG.memoize_articles = False
+_NEWS_CFG.request_timeout = 10
+_NEWS_CFG.browser_user_agent = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36"
+)
+
+# On-disk cache so re-runs skip re-downloading articles and re-analyzing unchanged ones
+CACHE_DIR = os.getenv("SUMMARIZER_CACHE_DIR", os.path.expanduser("~/.cache/freshrss_ai_summarizer"))
+CACHE_EXPIRE = 86400  # Seconds to keep cached article contents and analyses
+_CACHE = None  # Opened by init_runtime()
+
 # FreshRSS API Settings
 FRESHRSS_API = "http://localhost:8080/api/greader.php"
 FRESHRSS_AUTH_TOKEN = os.getenv("FRESHRSS_AUTH_TOKEN")
+# IANA timezone that defines "today" (e.g., America/New_York); defaults to the system's local timezone
+FRESHRSS_TIMEZONE = ZoneInfo(os.environ["SUMMARIZER_TZ"]) if os.getenv("SUMMARIZER_TZ") else None
 
 # OpenAI API Settings
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-openai_client = openai.Client(api_key=OPENAI_API_KEY)
+openai_client = None  # Created by init_runtime()
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", 8))  # Max in-flight OpenAI requests
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", 100_000))  # Max prompt tokens when packing articles into one call
+BATCH_MAX_ARTICLES = 8  # Keep batched responses well within the model's output token limit
+DEDUP_THRESHOLD = 0.8  # Articles whose contents exceed this estimated Jaccard similarity are analyzed once
+DEDUP_NUM_PERM = 64  # MinHash permutations; more is more accurate but slower
+OPENAI_BATCH_KEY = "openai_batch"  # Cache key of the pending Batch API job, if any
 
 # Ollama API URL
 OLLAMA_API_URL = "http://127.0.0.1:11434/api/generate"
-
-# RAM Monitoring
-RAM_THRESHOLD = 80  # Terminate script if RAM usage exceeds this percentage
-CHECK_INTERVAL = 1  # Check RAM usage every second
-terminate_flag = False
+JSON_HEADERS = {"Content-Type": "application/json"}
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", 4))  # Match the Ollama server's OLLAMA_NUM_PARALLEL
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model loaded between articles and across runs
+OLLAMA_NUM_PREDICT = 1024  # Max tokens generated per article analysis
+OLLAMA_SUMMARY_NUM_PREDICT = 2048  # Max tokens generated for the consolidated summary
+# num_ctx of every Ollama call; one fixed size means the model is loaded once per run. Prompts are truncated to fit.
+OLLAMA_MAX_CTX = int(os.getenv("OLLAMA_MAX_CTX", 8192))
+OLLAMA_NUM_THREAD = psutil.cpu_count(logical=False) or os.cpu_count()  # Ollama's default can under-drive physical cores
+
+# RAM Limits
+RAM_THRESHOLD = 80  # Cap the script's memory at this percentage of total RAM
+FALLBACK_CHECK_INTERVAL = 10  # Seconds between RAM checks where RLIMIT_AS is unavailable
 
 # Global user choices
 selected_language = "English"
+selected_backend = None
 selected_model = None
 selected_analyzer = None
 
+@dataclass(slots=True, frozen=True)
+class ArticleRef:
+    """A FreshRSS article published today."""
+    title: str
+    url: str
+    timestamp: int
+
+# Matches the per-article blocks of a batched OpenAI response
+_BATCH_ANALYSIS_RE = re.compile(r"""<analysis id=["']?(\d+)["']?>(.*?)</analysis>""", re.DOTALL)
+
+# Matches dollar amounts so they can be wrapped in backticks (prevents LaTeX rendering)
+_MONEY_RE = re.compile(r"(\$\s?\d[\d,\.]*)")
+
 # System Prompts (Now Include User Language)
-def get_article_prompt():
+@lru_cache(maxsize=8)
+def get_article_prompt(language):
     return (
         "You are a financial journalist and market analyst. Your job is to analyze news articles, "
         "extract key insights, and summarize content. **You must always complete the analysis** "
@@ -64,10 +133,11 @@ def get_article_prompt():
         "   - **DO NOT generate financial advice.**\n"
         "   - **DO NOT suggest trades, investments, or speculative market actions.**\n"
         "   - **Only analyze what is explicitly in the article.**\n\n"
-        f"**Provide the response in the following language: {selected_language}**"
+        f"**Provide the response in the following language: {language}**"
     )
 
-def get_summary_prompt():
+@lru_cache(maxsize=8)
+def get_summary_prompt(language):
     return (
         "You are a financial journalist tasked with summarizing multiple news analyses. "
         "You must provide a **cohesive final summary** of the articles, highlighting "
@@ -78,42 +148,81 @@ def get_summary_prompt():
         "- Summarize the market trends **based only on the articles analyzed**.\n"
         "- **Do not introduce additional financial opinions or speculations.**\n"
         "- Format the response in Markdown for structured readability.\n\n"
-        f"**Provide the response in the following language: {selected_language}**"
+        f"**Provide the response in the following language: {language}**"
     )
 
-def monitor_ram_usage():
-    """Monitor RAM usage and terminate script if it exceeds threshold."""
-    global terminate_flag
-    while not terminate_flag:
-        if psutil.virtual_memory().percent >= RAM_THRESHOLD:
-            console.print(f"\n[bold red]Critical: RAM usage exceeded {RAM_THRESHOLD}%. Terminating script.[/bold red]\n")
+def monitor_ram_usage(max_bytes):
+    """Fallback watchdog: terminate script if its own memory use exceeds max_bytes."""
+    process = psutil.Process()
+    while True:
+        # Only this process counts, so a large Ollama model loading alongside doesn't trip the watchdog
+        if process.memory_info().rss >= max_bytes:
+            console.print(f"\n[bold red]Critical: Memory limit of {RAM_THRESHOLD}% of RAM reached. Terminating script.[/bold red]\n")
             os._exit(1)
-        time.sleep(CHECK_INTERVAL)
+        time.sleep(FALLBACK_CHECK_INTERVAL)
+
+def limit_ram_usage():
+    """Let the kernel cap the script's address space, polling only where that isn't supported."""
+    max_bytes = int(psutil.virtual_memory().total * RAM_THRESHOLD / 100)
+
+    if resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            max_bytes = min(max_bytes, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (max_bytes, hard))
+            return
+        except (ValueError, OSError):
+            pass  # e.g. macOS does not allow lowering RLIMIT_AS
+
+    threading.Thread(target=monitor_ram_usage, args=(max_bytes,), daemon=True).start()
+
+def init_runtime():
+    """
+    Apply the RAM cap and open the cache and the OpenAI client.
 
-ram_monitor_thread = threading.Thread(target=monitor_ram_usage, daemon=True)
-ram_monitor_thread.start()
+    Called from __main__ rather than at import, so the spawned parsing workers (which re-import this module)
+    don't start a RAM watchdog, open the cache or build an HTTP client each.
+    """
+    global _CACHE, openai_client
+    limit_ram_usage()
+    _CACHE = Cache(CACHE_DIR)
+    # HTTP/2 lets concurrent completions share one connection (and one TLS handshake)
+    openai_client = openai.AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=openai.DefaultAsyncHttpxClient(http2=True, limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS))
+    )
 
-def choose_language():
-    """Prompt the user to select a language."""
+def choose_language(language=None):
+    """Use the given language, or prompt the user to select one."""
     global selected_language
-    console.print("\n[bold yellow]Type your preferred language (e.g., English, Chinese (Simplified), Spanish):[/bold yellow]")
-    selected_language = input("Enter language: ").strip()
+    if not language:
+        console.print("\n[bold yellow]Type your preferred language (e.g., English, Chinese (Simplified), Spanish):[/bold yellow]")
+        language = input("Enter language: ").strip()
+    selected_language = language
     console.print(f"\n[bold green]Language set to: {selected_language}[/bold green]")
 
-def choose_model():
-    """Prompt the user to select OpenAI or Ollama, while displaying popular models."""
-    global selected_model, selected_analyzer
+def choose_model(backend=None, model=None):
+    """Use the given backend and model, or prompt the user to select OpenAI or Ollama while displaying popular models."""
+    global selected_backend, selected_model, selected_analyzer
 
-    console.print("\n[bold yellow]Choose the LLM model source:[/bold yellow]")
-    console.print("[1] OpenAI API (Requires API key and sufficient balance)")
-    console.print("[2] Ollama (Runs locally, requires pre-installed models)")
+    if not backend:
+        console.print("\n[bold yellow]Choose the LLM model source:[/bold yellow]")
+        console.print("[1] OpenAI API (Requires API key and sufficient balance)")
+        console.print("[2] Ollama (Runs locally, requires pre-installed models)")
 
-    while True:
-        choice = input("\nEnter choice (1 for OpenAI, 2 for Ollama): ").strip()
-        
-        if choice == "1":
-            selected_analyzer = analyze_with_openai
-            console.print("\n[bold green]Using OpenAI API...[/bold green]")
+        while not backend:
+            choice = input("\nEnter choice (1 for OpenAI, 2 for Ollama): ").strip()
+            backend = {"1": "openai", "2": "ollama"}.get(choice)
+            if not backend:
+                console.print("[bold red]Invalid choice! Please enter 1 or 2.[/bold red]")
+
+    selected_backend = backend
+    selected_analyzer = ANALYZERS[backend]
+
+    if backend == "openai":
+        console.print("\n[bold green]Using OpenAI API...[/bold green]")
+        if not model:
             console.print(
                 "\nPopular OpenAI models:\n"
                 "- o1\n"
@@ -121,159 +230,468 @@ def choose_model():
                 "- gpt-4o-mini\n"
                 "- o3-mini"
             )
-            selected_model = input("\nEnter OpenAI model name: ").strip()
-            return
-        
-        elif choice == "2":
-            selected_analyzer = analyze_with_ollama
-            console.print("\n[bold green]Using Ollama local models...[/bold green]")
-            console.print(
-                "\nPopular Ollama models:\n"
-                "- deepseek-r1 (1.5B-671B)\n"
-                "- llama3.3\n"
-                "- phi4\n"
-                "- llama3.2 (1B-3B)\n"
-                "\n[italic]For models with multiple parameter sizes, specify as 'model:parameter' (e.g., llama3.2:1b). Not all models support non-English languages and not all models can generate a consolidated summary.[/italic]"
-            )
-            selected_model = input("\nEnter Ollama model name: ").strip()
-            return
-        
-        else:
-            console.print("[bold red]Invalid choice! Please enter 1 or 2.[/bold red]")
+            model = input("\nEnter OpenAI model name: ").strip()
+        selected_model = model
+        return
+
+    console.print("\n[bold green]Using Ollama local models...[/bold green]")
+    if not model:
+        console.print(
+            "\nPopular Ollama models:\n"
+            "- deepseek-r1 (1.5B-671B)\n"
+            "- llama3.3\n"
+            "- phi4\n"
+            "- llama3.2 (1B-3B)\n"
+            "\n[italic]For models with multiple parameter sizes, specify as 'model:parameter' (e.g., llama3.2:1b). Not all models support non-English languages and not all models can generate a consolidated summary.[/italic]"
+            "\n[italic]For faster inference, prefer Q4_K_M quantized tags (e.g., llama3.2:3b-instruct-q4_K_M), which use about half the memory bandwidth of FP16.[/italic]"
+        )
+        model = input("\nEnter Ollama model name: ").strip()
+    selected_model = model
 
-def get_articles_published_today():
+async def get_articles_published_today(session):
     """
     Fetch articles from FreshRSS using the stored Auth token.
 
     Returns:
-        list: A list of articles published today with their title, URL, and timestamp.
+        list[ArticleRef]: Articles published today with their title, URL, and timestamp.
     """
     headers = {
         "Authorization": f"GoogleLogin auth={FRESHRSS_AUTH_TOKEN}",
         "Accept": "application/json"
     }
 
-    response = requests.get(f"{FRESHRSS_API}/reader/api/0/stream/contents", headers=headers)
+    today = datetime.now(FRESHRSS_TIMEZONE).date()
+    # Only uncomment if you are running script at midnight or after.
+    # today = (datetime.now(FRESHRSS_TIMEZONE) - timedelta(days=1)).date()
 
-    if response.status_code == 401:
-        raise Exception("Unauthorized: Check FreshRSS Auth token in .env.")
+    # Day bounds as epoch seconds, so filtering is an integer comparison per entry
+    start_of_day = int(datetime.combine(today, dt_time.min, tzinfo=FRESHRSS_TIMEZONE).timestamp())
+    end_of_day = int(datetime.combine(today + timedelta(days=1), dt_time.min, tzinfo=FRESHRSS_TIMEZONE).timestamp())
 
-    if response.status_code != 200:
-        raise Exception(f"Failed to fetch FreshRSS articles: {response.text}")
+    # Let FreshRSS drop everything crawled before today (`ot`) instead of shipping the whole stream.
+    # `ot` filters on crawl time, so the published-date check below is still needed.
+    params = {"ot": start_of_day, "n": 1000, "output": "json"}
 
-    articles = []
-    today = datetime.now().date()
-    # Only uncomment if you are running script at midnight or after.
-    # today = (datetime.now() - timedelta(days=1)).date()
+    async with session.get(f"{FRESHRSS_API}/reader/api/0/stream/contents", headers=headers, params=params) as response:
+        if response.status == 401:
+            raise Exception("Unauthorized: Check FreshRSS Auth token in .env.")
 
-    for entry in response.json().get("items", []):
-        article_date = datetime.fromtimestamp(entry["published"]).date()
-        if article_date == today:
-            articles.append({
-                "title": entry["title"],
-                "url": entry["alternate"][0]["href"],
-                "timestamp": entry["published"]
-            })
+        if response.status != 200:
+            raise Exception(f"Failed to fetch FreshRSS articles: {await response.text()}")
 
-    return articles
+        body = await response.read()
 
-def get_clean_article_content(article_url):
-    """Extract clean article content using newspaper3k."""
+    return [
+        ArticleRef(entry["title"], entry["alternate"][0]["href"], entry["published"])
+        for entry in orjson.loads(body).get("items", [])
+        if start_of_day <= entry["published"] < end_of_day
+    ]
+
+def _sha1(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+async def download_article_html(article_url, session):
+    """Download an article's raw HTML bytes through the shared session."""
+    timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=_NEWS_CFG.request_timeout)
     try:
-        article = Article(article_url)
-        article.download()
+        async with session.get(article_url, headers={"User-Agent": _NEWS_CFG.browser_user_agent}, timeout=timeout) as response:
+            response.raise_for_status()
+            # Leave decoding to newspaper3k, which also honours <meta charset> when the header has none
+            return await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+def parse_article_html(html, article_url):
+    """Extract clean article content from downloaded HTML bytes using newspaper3k."""
+    try:
+        article = Article(article_url, config=_NEWS_CFG)
+        article.download(input_html=html)
         article.parse()
         return article.text
+    except MemoryError:
+        raise  # Hitting the RLIMIT_AS cap must terminate the script, not skip an article
     except Exception:
         return None
 
-def analyze_with_openai(article):
-    """Analyze article with OpenAI."""
-    article_content = get_clean_article_content(article["url"])
-    if not article_content:
-        return f"**Skipping article:** *{article['title']}* (Could not extract content)."
+def content_minhash(article_content):
+    """MinHash of an article's 3-word shingles, for near-duplicate detection."""
+    words = article_content.lower().split()
+    minhash = MinHash(num_perm=DEDUP_NUM_PERM)
+    for j in range(max(1, len(words) - 2)):
+        minhash.update(" ".join(words[j:j + 3]).encode("utf-8"))
+    return minhash
+
+def find_duplicates(articles, contents):
+    """
+    Find articles whose contents nearly duplicate an earlier article's (e.g., the same wire story on several outlets).
+
+    Returns:
+        dict: Index of each duplicate article mapped to the index of the first article it duplicates.
+    """
+    lsh = MinHashLSH(threshold=DEDUP_THRESHOLD, num_perm=DEDUP_NUM_PERM)
+    duplicates = {}
+    for i, article in enumerate(articles):
+        article_content = contents[article.url]
+        if not article_content:
+            continue
+        minhash = content_minhash(article_content)
+        matches = lsh.query(minhash)
+        if matches:
+            duplicates[i] = min(matches)
+        else:
+            lsh.insert(i, minhash)
+    return duplicates
 
-    response = openai_client.chat.completions.create(
+def analysis_cache_key(article, article_content):
+    """Key an LLM analysis by backend, model, prompt, URL and content so unchanged articles are reused."""
+    return (
+        "analysis",
+        selected_analyzer.__name__,
+        selected_model,
+        _sha1(get_article_prompt(selected_language)),
+        _sha1(article.url),
+        _sha1(article_content or "")
+    )
+
+async def prefetch_contents(articles, session):
+    """
+    Download and extract all article contents in parallel, keyed by URL.
+
+    Downloads are I/O-bound and run concurrently on the shared session; newspaper3k parsing is CPU-bound
+    and runs on a process pool. Extracted contents are cached on disk by URL.
+    """
+    contents = {a.url: _CACHE.get(("content", _sha1(a.url))) for a in articles}
+    missing = [url for url, content in contents.items() if content is None]
+    if not missing:
+        return contents
+
+    htmls = await asyncio.gather(*[download_article_html(url, session) for url in missing])
+    downloaded = [(url, html) for url, html in zip(missing, htmls) if html]
+
+    if len(downloaded) > 1:
+        loop = asyncio.get_running_loop()
+
+        async def parse_in_pool(executor, html, url):
+            try:
+                return await loop.run_in_executor(executor, parse_article_html, html, url)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed at the RAM cap) and took the pool down; parse this page here instead
+                return parse_article_html(html, url)
+
+        # Spawn rather than fork: forking while the event loop and helper threads run can deadlock the workers
+        with ProcessPoolExecutor(
+            max_workers=psutil.cpu_count(logical=False) or os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            texts = await asyncio.gather(*[parse_in_pool(executor, html, url) for url, html in downloaded])
+    else:
+        texts = [parse_article_html(html, url) for url, html in downloaded]
+
+    for (url, _), text in zip(downloaded, texts):
+        contents[url] = text
+        # Only cache successful extractions so transient failures are retried next run
+        if text:
+            _CACHE.set(("content", _sha1(url)), text, expire=CACHE_EXPIRE)
+    return contents
+
+async def stream_openai(system_prompt, user_content):
+    """Stream a chat completion from OpenAI, yielding text deltas as they arrive."""
+    stream = await openai_client.chat.completions.create(
         model=selected_model,
         messages=[
-            {"role": "system", "content": get_article_prompt()},
-            {"role": "user", "content": f"**Title:** {article['title']}\n\n**Content:**\n{article_content}"}
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
         ],
-        temperature=0.3
+        temperature=0.3,
+        stream=True
     )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def estimate_tokens(text):
+    """Rough token count: ~4 characters per token for ASCII text, ~1 per character otherwise (e.g. CJK)."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars // 4 + len(text) - ascii_chars
+
+def fit_ollama_prompt(prefix, content, num_predict=OLLAMA_NUM_PREDICT):
+    """Truncate content so the prompt plus generated tokens fit in OLLAMA_MAX_CTX."""
+    budget = max(0, OLLAMA_MAX_CTX - num_predict - estimate_tokens(prefix))
+    end = budget * 4
+    # Shrink proportionally until the estimate fits; each pass strictly shortens the cut
+    while estimate_tokens(content[:end]) > budget:
+        end = end * budget // estimate_tokens(content[:end])
+    return prefix + content[:end]
+
+def ollama_article_prompt(article, article_content):
+    prefix = f"{get_article_prompt(selected_language)}\n\n**Title:** {article.title}\n\n**Content:**\n"
+    return fit_ollama_prompt(prefix, article_content)
+
+def ollama_options(num_predict=OLLAMA_NUM_PREDICT):
+    return {
+        "num_ctx": OLLAMA_MAX_CTX,
+        "num_predict": num_predict,
+        "num_thread": OLLAMA_NUM_THREAD,
+        "num_batch": 512
+    }
 
-    # Prevent $ from being rendered as LaTex
-    return re.sub(r"(\$\s?\d[\d,\.]*)", r"`\1`", response.choices[0].message.content)
-
-def analyze_with_ollama(article):
-    """Analyze article with Ollama."""
-    article_content = get_clean_article_content(article["url"])
-    if not article_content:
-        return f"**Skipping article:** *{article['title']}* (Could not extract content)."
+async def prewarm_ollama(session):
+    """Load the selected Ollama model; run as a background task so it overlaps with fetching articles."""
+    payload = {
+        "model": selected_model,
+        "prompt": "",
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": ollama_options()
+    }
+    timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=600)
 
-    prompt = f"{get_article_prompt()}\n\n**Title:** {article['title']}\n\n**Content:**\n{article_content}"
+    try:
+        async with session.post(OLLAMA_API_URL, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=timeout) as response:
+            await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass  # The first real request will surface any connection problem
 
+async def stream_ollama(prompt, session, num_predict=OLLAMA_NUM_PREDICT):
+    """Stream a generation from Ollama, yielding text deltas as they arrive."""
     payload = {
         "model": selected_model,
         "prompt": prompt,
-        "stream": False,
-        "options": {
-            "num_ctx": 8192
-        }
+        "stream": True,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": ollama_options(num_predict)
     }
 
-    headers = {"Content-Type": "application/json"}
+    # Ollama sends nothing until the request is scheduled (queued behind its parallel limit or a model load),
+    # so only the gap between streamed lines is bounded by the read timeout
+    timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=None)
 
     try:
-        response = requests.post(OLLAMA_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        response_json = response.json()
-        return re.sub(r"(\$\s?\d[\d,\.]*)", r"`\1`", response_json.get("response", "**Error: No response from Ollama**"))
+        async with session.post(OLLAMA_API_URL, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=timeout) as response:
+            response.raise_for_status()
+            # Ollama streams one JSON object per line. Lines are split here rather than with readline(), whose
+            # 128 KiB limit the final line (it carries the whole context token array) can exceed at large num_ctx.
+            buffer = b""
+            while chunk := await asyncio.wait_for(response.content.readany(), HTTP_TIMEOUT[1]):
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        message = orjson.loads(line)
+                        yield message.get("response", "")
+                        if message.get("done"):
+                            return
+            if buffer.strip():
+                yield orjson.loads(buffer).get("response", "")
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise RuntimeError(f"Failed to connect to Ollama API: {str(e)}") from e
+
+async def analyze_with_openai(article, article_content, session):
+    """Analyze article with OpenAI."""
+    if not article_content:
+        yield f"**Skipping article:** *{article.title}* (Could not extract content)."
+        return
 
-    except requests.RequestException as e:
-        return f"**Error:** Failed to connect to Ollama API: {str(e)}"
+    user_content = f"**Title:** {article.title}\n\n**Content:**\n{article_content}"
+    async for delta in stream_openai(get_article_prompt(selected_language), user_content):
+        yield delta
 
-def generate_consolidated_summary(articles_analysis):
-    """Generate final summary using OpenAI or Ollama."""
-    user_content = "\n\n".join(articles_analysis)
+async def analyze_with_ollama(article, article_content, session):
+    """Analyze article with Ollama."""
+    if not article_content:
+        yield f"**Skipping article:** *{article.title}* (Could not extract content)."
+        return
+
+    prompt = ollama_article_prompt(article, article_content)
+    async for delta in stream_ollama(prompt, session):
+        yield delta
+
+ANALYZERS = {"openai": analyze_with_openai, "ollama": analyze_with_ollama}
+
+@lru_cache(maxsize=8)
+def get_batch_prompt(language):
+    return (
+        f"{get_article_prompt(language)}\n\n"
+        "## **BATCH FORMAT**\n"
+        "Several articles are provided, each wrapped in `<article id=N>...</article>`. "
+        "Analyze each article separately and respond with one `<analysis id=N>...</analysis>` block per article, "
+        "using the same id as the article. Do not write anything outside these blocks."
+    )
+
+@lru_cache(maxsize=8)
+def get_encoding(model):
+    """Return the tiktoken encoding for a model, falling back to the current default for unknown models."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+def format_batch_article(batch_id, article, article_content):
+    return f"<article id={batch_id}>\n**Title:** {article.title}\n\n**Content:**\n{article_content}\n</article>"
+
+def pack_batches(pending):
+    """
+    Greedily pack (index, article, content) tuples into batches that fit BATCH_TOKEN_BUDGET.
+
+    Returns:
+        list: Batches of (index, article, content) tuples, in their original order.
+    """
+    encoding = get_encoding(selected_model)
+    budget = BATCH_TOKEN_BUDGET - len(encoding.encode(get_batch_prompt(selected_language)))
+
+    batches, current, used = [], [], 0
+    for item in pending:
+        _, article, article_content = item
+        tokens = len(encoding.encode(format_batch_article(len(current) + 1, article, article_content)))
+        if current and (used + tokens > budget or len(current) >= BATCH_MAX_ARTICLES):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+async def analyze_batch_with_openai(batch):
+    """Analyze several articles in a single OpenAI call, streaming the raw tagged response."""
+    user_content = "\n\n".join(
+        format_batch_article(batch_id, article, article_content)
+        for batch_id, (_, article, article_content) in enumerate(batch, start=1)
+    )
+    async for delta in stream_openai(get_batch_prompt(selected_language), user_content):
+        yield delta
 
+def split_batch_response(response, batch_size):
+    """Split a batched response into per-article analyses, in batch order (None where the model skipped an article)."""
+    sections = {int(batch_id): text.strip() for batch_id, text in _BATCH_ANALYSIS_RE.findall(response)}
+    return [sections.get(batch_id) for batch_id in range(1, batch_size + 1)]
+
+async def generate_consolidated_summary(articles_analysis, session):
+    """Generate final summary using OpenAI or Ollama."""
     # Prompt for OpenAI Models
-    if selected_analyzer == analyze_with_openai:
-        response = openai_client.chat.completions.create(
-            model=selected_model,
-            messages=[
-                {"role": "system", "content": get_summary_prompt()},
-                {"role": "user", "content": user_content}
-            ],
-            temperature=0.3
+    if selected_backend == "openai":
+        async for delta in stream_openai(get_summary_prompt(selected_language), "\n\n".join(articles_analysis)):
+            yield delta
+        return
+
+    # Prompt for models running off Ollama: whole analyses, in feed order, for as long as they fit the context
+    prefix = f"{get_summary_prompt(selected_language)}\n\n"
+    budget = OLLAMA_MAX_CTX - OLLAMA_SUMMARY_NUM_PREDICT - estimate_tokens(prefix)
+    included = []
+    for analysis in articles_analysis:
+        budget -= estimate_tokens(analysis) + 1
+        if budget < 0:
+            break
+        included.append(analysis)
+    if len(included) < len(articles_analysis):
+        console.print(
+            f"[bold yellow]The summary covers {len(included)} of {len(articles_analysis)} analyses; "
+            "raise OLLAMA_MAX_CTX to include the rest.[/bold yellow]"
         )
-        return response.choices[0].message.content
+    # A single analysis too long for the context is cut rather than leaving the summary with nothing
+    prompt = fit_ollama_prompt(prefix, "\n\n".join(included or articles_analysis[:1]), OLLAMA_SUMMARY_NUM_PREDICT)
+    async for delta in stream_ollama(prompt, session, num_predict=OLLAMA_SUMMARY_NUM_PREDICT):
+        yield delta
 
-    # Prompt for models running off Ollama
-    payload = {
-        "model": selected_model,
-        "prompt": f"{get_summary_prompt()}\n\n{user_content}",
-        "stream": False,
-        "options": {
-            "num_ctx": 8192
-        }
-    }
 
-    headers = {"Content-Type": "application/json"}
+async def submit_openai_batch(articles, contents, pending):
+    """
+    Submit uncached articles to the OpenAI Batch API (50% cheaper, completes within 24h).
 
-    try:
-        response = requests.post(OLLAMA_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        response_json = response.json()
-        return response_json.get("response", "**Error: No summary response from Ollama**")
+    The batch id, the run's full article list and contents, and the analysis cache key of each request are stored
+    on disk so a later run can collect the results and render this run's digest without downloading anything again. Each request's custom_id is
+    `article-<index>`, its article's position in the stored list.
+    """
+    lines = []
+    cache_keys = {}
+    for i, article, article_content in pending:
+        custom_id = f"article-{i}"
+        cache_keys[custom_id] = analysis_cache_key(article, article_content)
+        lines.append(orjson.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": selected_model,
+                "messages": [
+                    {"role": "system", "content": get_article_prompt(selected_language)},
+                    {"role": "user", "content": f"**Title:** {article.title}\n\n**Content:**\n{article_content}"}
+                ],
+                "temperature": 0.3
+            }
+        }))
+
+    batch_file = await openai_client.files.create(file=("batch.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = await openai_client.batches.create(
+        input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    _CACHE.set(OPENAI_BATCH_KEY, {
+        "id": batch.id,
+        "articles": [(a.title, a.url, a.timestamp) for a in articles],
+        # The content cache may have expired by collection time, and pages can vanish or get paywalled
+        "contents": contents,
+        "cache_keys": cache_keys
+    })
+    console.print(
+        f"\n[bold green]Submitted {len(pending)} articles as OpenAI batch {batch.id}.[/bold green]"
+        "\nRe-run with --batch later to collect the results."
+    )
 
-    except requests.RequestException as e:
-        return f"**Error:** Failed to connect to Ollama API: {str(e)}"
+async def collect_openai_batch():
+    """
+    Collect a previously submitted OpenAI batch, also storing its results in the analysis cache.
 
+    Returns:
+        tuple: (status, articles, contents, analyses). status is "running" if the batch is still in progress,
+        "collected" once its results are in, or None if no batch was pending. For a collected batch,
+        articles and contents are those it was submitted with and analyses maps article indices to results;
+        otherwise they are None, None and {}.
+    """
+    record = _CACHE.get(OPENAI_BATCH_KEY)
+    if record is None:
+        return None, None, None, {}
+
+    batch = await openai_client.batches.retrieve(record["id"])
+    if batch.status in ("validating", "in_progress", "finalizing", "cancelling"):
+        # request_counts is not populated until the batch has been validated
+        counts = batch.request_counts
+        progress = f" ({counts.completed}/{counts.total} done)" if counts else ""
+        console.print(
+            f"\n[bold yellow]OpenAI batch {batch.id} is {batch.status}{progress}. "
+            "Re-run later to collect the results.[/bold yellow]"
+        )
+        return "running", None, None, {}
+
+    analyses = {}
+    # Expired batches can still carry partial output
+    if batch.output_file_id:
+        output = await openai_client.files.content(batch.output_file_id)
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            cache_key = record["cache_keys"].get(result["custom_id"])
+            response = result.get("response") or {}
+            if cache_key and response.get("status_code") == 200:
+                analysis = response["body"]["choices"][0]["message"]["content"]
+                analyses[int(result["custom_id"].removeprefix("article-"))] = analysis
+                _CACHE.set(cache_key, analysis, expire=CACHE_EXPIRE)
+
+    if batch.status != "completed":
+        console.print(f"\n[bold red]OpenAI batch {batch.id} ended as {batch.status}; analyzing what is missing directly.[/bold red]")
+    _CACHE.delete(OPENAI_BATCH_KEY)
+    return "collected", [ArticleRef(*article) for article in record["articles"]], record["contents"], analyses
+
+async def display_analysis(session, use_batch_api=False):
+    """Fetch articles and analyze them concurrently, streaming in-flight output and rendering the results once."""
+    batch_status, articles, contents, batch_analyses = (
+        await collect_openai_batch() if use_batch_api else (None, None, None, {})
+    )
+    if batch_status == "running":
+        return
 
-def display_analysis():
-    """Fetch articles and analyze them."""
-    articles = get_articles_published_today()
+    # A collected batch renders the articles it was submitted for, even if the day has rolled over since
+    if articles is None:
+        articles = await get_articles_published_today(session)
     if not articles:
         console.print("[bold red]No articles published today.[/bold red]")
         return
@@ -282,17 +700,164 @@ def display_analysis():
         console.print("[bold red]Error: No model selected for analysis![/bold red]")
         return
 
-    articles_analysis = []
-    for article in articles:
-        console.print(Markdown(f"## {article['title']}"))
-        analysis = selected_analyzer(article)
-        console.print(Markdown(analysis))
-        articles_analysis.append(analysis)
+    # Bound in-flight requests so we don't overrun the backend's parallelism
+    max_parallel = OPENAI_MAX_CONCURRENCY if selected_backend == "openai" else OLLAMA_NUM_PARALLEL
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    # Fetch every article body up front instead of once per analyzer call (a collected batch brings its own)
+    if contents is None:
+        contents = await prefetch_contents(articles, session)
+
+    # Near-duplicates reuse the original's analysis instead of costing another LLM call
+    duplicates = find_duplicates(articles, contents)
+
+    results = [None] * len(articles)
+    pending = []
+    for i, article in enumerate(articles):
+        article_content = contents[article.url]
+        if i in duplicates:
+            continue
+        # An analysis the batch already paid for is used even if the content is gone
+        if i in batch_analyses:
+            results[i] = batch_analyses[i]
+        elif not article_content:
+            results[i] = f"**Skipping article:** *{article.title}* (Could not extract content)."
+        else:
+            results[i] = _CACHE.get(analysis_cache_key(article, article_content))
+            if results[i] is None:
+                pending.append((i, article, article_content))
+
+    # Articles the collected batch didn't cover are analyzed directly so this run still yields a full digest
+    if use_batch_api and pending and batch_status != "collected":
+        await submit_openai_batch(articles, contents, pending)
+        return
 
-    summary = generate_consolidated_summary(articles_analysis)
+    # OpenAI can analyze several articles per call; small local models do better one at a time
+    if selected_backend == "openai":
+        groups = pack_batches(pending)
+    else:
+        groups = [[item] for item in pending]
+
+    # Partial responses of in-flight calls, keyed by the tuple of article indices in the call
+    buffers = {}
+
+    def render_in_flight():
+        # Called from Live's refresh thread while the event loop adds and removes buffers, so iterate a snapshot
+        return Markdown("\n\n".join(
+            "## " + " / ".join(articles[i].title for i in key) + f"\n\n{buf}"
+            for key, buf in list(buffers.items())
+        ))
+
+    def record(i, analysis):
+        # Prevent $ from being rendered as LaTex
+        results[i] = _MONEY_RE.sub(r"`\1`", analysis)
+
+    async def run_group(group):
+        key = tuple(i for i, _, _ in group)
+        async with semaphore:
+            buffers[key] = ""
+            try:
+                if len(group) == 1:
+                    _, article, article_content = group[0]
+                    stream = selected_analyzer(article, article_content, session)
+                else:
+                    stream = analyze_batch_with_openai(group)
+                async for delta in stream:
+                    buffers[key] += delta
+                response = buffers.pop(key)
+            except MemoryError:
+                raise
+            except Exception as e:
+                buffers.pop(key, None)
+                for i, _, _ in group:
+                    record(i, f"**Error:** Failed to analyze article: {str(e)}")
+                return
+
+        analyses = [response] if len(group) == 1 else split_batch_response(response, len(group))
+        skipped = []
+        for item, analysis in zip(group, analyses):
+            i, article, article_content = item
+            if analysis is None:
+                skipped.append(item)
+                continue
+            _CACHE.set(analysis_cache_key(article, article_content), analysis, expire=CACHE_EXPIRE)
+            record(i, analysis)
+
+        # Articles the model left out of a batched response get their own single-article call
+        await asyncio.gather(*[run_group([item]) for item in skipped])
+
+    # Cached and skipped articles are already complete
+    for i, analysis in enumerate(results):
+        if analysis is not None:
+            record(i, analysis)
+
+    # Live re-renders at most refresh_per_second, not once per token
+    with Live(console=console, refresh_per_second=10, transient=True, get_renderable=render_in_flight):
+        await asyncio.gather(*[run_group(group) for group in groups])
+
+    for i, original in duplicates.items():
+        record(i, f"*Same story as* **{articles[original].title}** *— see the analysis above.*")
+
+    # Parse and render all analyses once, in feed order, rather than once per article
+    console.print(Markdown("\n\n---\n\n".join(
+        f"## {article.title}\n\n{analysis}" for article, analysis in zip(articles, results)
+    )))
+
+    # Duplicates are left out so the summary doesn't weight a story by how many outlets ran it
+    unique_results = [analysis for i, analysis in enumerate(results) if i not in duplicates]
+
+    summary = ""
+    with Live(console=console, refresh_per_second=10, transient=True, get_renderable=lambda: Markdown(summary)):
+        try:
+            async for delta in generate_consolidated_summary(unique_results, session):
+                summary += delta
+        except MemoryError:
+            raise
+        except Exception as e:
+            summary += f"\n\n**Error:** Failed to generate summary: {str(e)}"
     console.print(Markdown(summary))
 
+async def main(use_batch_api=False):
+    """Run the analysis with one HTTP session shared by FreshRSS, article downloads and Ollama."""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_MAX_CONNECTIONS, limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST, keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+    )
+    timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=HTTP_TIMEOUT[1])
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Load the Ollama model while articles are being fetched
+        prewarm = asyncio.create_task(prewarm_ollama(session)) if selected_backend == "ollama" else None
+        try:
+            await display_analysis(session, use_batch_api)
+        finally:
+            if prewarm:
+                prewarm.cancel()
+    await openai_client.close()
+
+def parse_args():
+    """Parse CLI flags; anything not given on the command line or in the environment is asked for interactively."""
+    parser = argparse.ArgumentParser(description="Analyze and summarize today's FreshRSS articles with OpenAI or Ollama.")
+    parser.add_argument("--language", default=os.getenv("SUMMARIZER_LANG"),
+                        help="Response language, e.g. English (env: SUMMARIZER_LANG)")
+    parser.add_argument("--backend", choices=ANALYZERS, default=os.getenv("SUMMARIZER_BACKEND"),
+                        help="LLM backend (env: SUMMARIZER_BACKEND)")
+    parser.add_argument("--model", default=os.getenv("SUMMARIZER_MODEL"),
+                        help="Model name, e.g. gpt-4o-mini or llama3.2:3b (env: SUMMARIZER_MODEL)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Submit OpenAI analyses through the Batch API at half the cost; re-run later to collect them")
+    args = parser.parse_args()
+    if args.backend not in (None, *ANALYZERS):
+        parser.error(f"--backend must be one of: {', '.join(ANALYZERS)}")
+    return args
+
 if __name__ == "__main__":
-    choose_language()
-    choose_model()
-    display_analysis()
\ No newline at end of file
+    args = parse_args()
+    init_runtime()
+    choose_language(args.language)
+    choose_model(args.backend, args.model)
+    if args.batch and selected_backend != "openai":
+        console.print("[bold yellow]--batch is only supported with OpenAI; analyzing directly.[/bold yellow]")
+    try:
+        asyncio.run(main(use_batch_api=args.batch and selected_backend == "openai"))
+    except MemoryError:
+        console.print(f"\n[bold red]Critical: Memory limit of {RAM_THRESHOLD}% of RAM reached. Terminating script.[/bold red]\n")
+        raise SystemExit(1)
\ No newline at end of file